@@ -24,6 +24,9 @@ COUNTRY_CODES = {
   'sh': b'J',
 }
 
+INPUT_RECORD = struct.Struct('>HBB')
+SIGNED_INPUT_RECORD = struct.Struct('>Hbb')
+
 
 def save_m64(filename: str, metadata: TasMetadata, pipeline: Pipeline, length: int) -> None:
   with open(filename, 'wb') as f:
@@ -53,14 +56,24 @@ def save_m64(filename: str, metadata: TasMetadata, pipeline: Pipeline, length: i
     f.write(bytes_to_buffer(metadata.authors.encode('utf-8'), 222))
     f.write(bytes_to_buffer(metadata.description.encode('utf-8'), 256))
 
+    buttons_variable = Variable('input-buttons')
+    stick_x_variable = Variable('input-stick-x')
+    stick_y_variable = Variable('input-stick-y')
+
+    # Consecutive frames usually have identical inputs, so reuse the packed record
+    prev_inputs: Optional[Tuple[int, int, int]] = None
+    record = b''
+
     for frame in range(length):
-      buttons = dcast(int, pipeline.read(Variable('input-buttons').with_frame(frame)))
-      stick_x = dcast(int, pipeline.read(Variable('input-stick-x').with_frame(frame)))
-      stick_y = dcast(int, pipeline.read(Variable('input-stick-y').with_frame(frame)))
+      buttons = dcast(int, pipeline.read(buttons_variable.with_frame(frame)))
+      stick_x = dcast(int, pipeline.read(stick_x_variable.with_frame(frame)))
+      stick_y = dcast(int, pipeline.read(stick_y_variable.with_frame(frame)))
 
-      f.write(struct.pack(b'>H', buttons & 0xFFFF))
-      f.write(struct.pack(b'=B', stick_x & 0xFF))
-      f.write(struct.pack(b'=B', stick_y & 0xFF))
+      inputs = (buttons & 0xFFFF, stick_x & 0xFF, stick_y & 0xFF)
+      if inputs != prev_inputs:
+        record = INPUT_RECORD.pack(*inputs)
+        prev_inputs = inputs
+      f.write(record)
 
 
 def load_m64(filename: str) -> Tuple[TasMetadata, Dict[Variable, object]]:
@@ -88,27 +101,28 @@ def load_m64(filename: str) -> Tuple[TasMetadata, Dict[Variable, object]]:
     )
     edits: Dict[Variable, object] = {}
 
+    button_flags = tuple(INPUT_BUTTON_FLAGS.items())
+    stick_x_variable = Variable('input-stick-x')
+    stick_y_variable = Variable('input-stick-y')
+    read = f.read
+    unpack_inputs = SIGNED_INPUT_RECORD.unpack
+
     f.seek(0x400)
     frame = 0
     while True:
       try:
-        buttons = struct.unpack('>H', f.read(2))[0]
-        stick_x = struct.unpack('=b', f.read(1))[0]
-        stick_y = struct.unpack('=b', f.read(1))[0]
+        buttons, stick_x, stick_y = unpack_inputs(read(4))
       except struct.error:
         break
 
-      for variable, flag in INPUT_BUTTON_FLAGS.items():
+      for variable, flag in button_flags:
         if buttons & flag:
           edits[variable.with_frame(frame)] = True
       if stick_x != 0:
-        edits[Variable('input-stick-x').with_frame(frame)] = stick_x
+        edits[stick_x_variable.with_frame(frame)] = stick_x
       if stick_y != 0:
-        edits[Variable('input-stick-y').with_frame(frame)] = stick_y
+        edits[stick_y_variable.with_frame(frame)] = stick_y
 
-      prev_buttons = buttons
-      prev_stick_x = stick_x
-      prev_stick_y = stick_y
       frame += 1
 
     return (metadata, edits)
@@ -1,8 +1,8 @@
 import sys
 from typing import *
 from abc import abstractmethod
-from dataclasses import dataclass, field
 import time
+import itertools
 
 from wafel_core import Variable
 
@@ -54,10 +54,33 @@ class CellDragHandler(Protocol):
   def highlight_range(self, variable: Variable) -> Optional[Tuple[range, ig.Color4f]]: ...
 
 
-@dataclass(unsafe_hash=True)
 class FrameSheetColumn:
-  variable: Variable
-  width: int = field(default=100, hash=False, compare=False)
+  # dataclass(slots=True) requires Python 3.10
+  __slots__ = ('variable', 'formatter', 'width', 'id', '_hash')
+
+  _next_id = itertools.count()
+
+  def __init__(self, variable: Variable, formatter: VariableFormatter, width: int = 100) -> None:
+    self.variable = variable
+    # Formatters only depend on the variable's name, so they can be shared by every cell in
+    # the column
+    self.formatter = formatter
+    self.width = width
+    # Short unique id used in imgui widget ids
+    self.id = next(FrameSheetColumn._next_id)
+    # Columns are hashed for every rendered cell, so compute it once
+    self._hash = hash(variable)
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, FrameSheetColumn):
+      return NotImplemented
+    return self._hash == other._hash and self.variable == other.variable
+
+  def __hash__(self) -> int:
+    return self._hash
+
+  def __repr__(self) -> str:
+    return f'FrameSheetColumn(variable={self.variable!r}, width={self.width!r})'
 
 
 class FrameSheet:
@@ -78,9 +101,18 @@ class FrameSheet:
     self.drag_handler = drag_handler
     self.displayer = displayer
     self.formatters = formatters
+    self.id_str = str(id(self))
 
     self.columns: List[FrameSheetColumn] = []
     self.next_columns: List[FrameSheetColumn] = []
+    self.column_set: Set[FrameSheetColumn] = set()
+    self.content_width = 0
+    # Set when next_columns differs from columns
+    self.columns_dirty = False
+
+    # Incremented whenever the columns are modified
+    self.columns_version = 0
+    self.header_cache: Optional[Tuple[int, List[str], int]] = None
 
     self.row_height = 30
     self.frame_column_width = 60
@@ -90,52 +122,81 @@ class FrameSheet:
 
     self.prev_selected_frame: Optional[int] = None
     self.scroll_delta = 0.0
+    self.extended_to_frame = -1
 
 
   def _insert_variable(self, index: int, variable: Variable) -> None:
     variable = variable.without_frame()
 
-    if self.columns != self.next_columns:
+    if self.columns_dirty:
       log.error('Multiple frame sheet column mods on same frame')
       return
 
     object_slot = variable.object
-    column = FrameSheetColumn(variable)
-    if column not in self.columns:
+    column = FrameSheetColumn(variable, self.formatters[variable])
+    if column not in self.column_set:
       self.next_columns.insert(index, column)
+      self.columns_version += 1
+      self.columns_dirty = True
 
 
   def append_variable(self, variable: Variable) -> None:
     self._insert_variable(len(self.columns), variable)
-    self.columns = list(self.next_columns)
+    self._commit_columns()
+
+
+  def _commit_columns(self) -> None:
+    if self.columns_dirty:
+      self.columns = list(self.next_columns)
+      self.column_set = set(self.columns)
+      self.content_width = self._compute_content_width()
+      self.columns_dirty = False
 
 
   def _move_column(self, source: int, dest: int) -> None:
-    if self.columns != self.next_columns:
+    if self.columns_dirty:
       log.error('Multiple frame sheet column mods on same frame')
       return
 
-    column = self.next_columns[source]
-    del self.next_columns[source]
-    self.next_columns.insert(dest, column)
+    if source == dest:
+      return
+    columns = self.next_columns
+    columns.insert(dest, columns.pop(source))
+    self.columns_version += 1
+    self.columns_dirty = True
 
 
   def _remove_column(self, index: int) -> None:
-    if self.columns != self.next_columns:
+    if self.columns_dirty:
       log.error('Multiple frame sheet column mods on same frame')
       return
     del self.next_columns[index]
+    self.columns_version += 1
+    self.columns_dirty = True
 
 
   def get_content_width(self) -> int:
+    return self.content_width
+
+
+  def _compute_content_width(self) -> int:
     if len(self.columns) == 0:
       return 0
     return self.frame_column_width + sum(column.width for column in self.columns)
 
 
+  def get_header_labels(self) -> Tuple[List[str], int]:
+    if self.header_cache is None or self.header_cache[0] != self.columns_version:
+      header_labels = [self.displayer.column_header(column.variable) for column in self.columns]
+      header_lines = max((len(label.split('\n')) for label in header_labels), default=1)
+      self.header_cache = (self.columns_version, header_labels, header_lines)
+    _, header_labels, header_lines = self.header_cache
+    return header_labels, header_lines
+
+
   def render_headers(self) -> None:
-    header_labels = [self.displayer.column_header(column.variable) for column in self.columns]
-    header_lines = max((len(label.split('\n')) for label in header_labels), default=1)
+    header_labels, header_lines = self.get_header_labels()
+    header_height = header_lines * ig.get_text_line_height()
 
     ig.columns(len(self.columns) + 1)
     if len(self.columns) > 0:
@@ -146,8 +207,8 @@ class FrameSheet:
     for index, column in enumerate(self.columns):
       initial_cursor_pos = ig.get_cursor_pos()
       ig.selectable(
-        '##fs-col-' + str(id(self)) + '-' + str(id(column)),
-        height = header_lines * ig.get_text_line_height(),
+        f'##fs-col-{self.id_str}-{column.id}',
+        height = header_height,
       )
 
       # TODO: Width adjusting
@@ -173,7 +234,7 @@ class FrameSheet:
       if ig.is_item_hovered() and ig.is_mouse_clicked(2):
         self._remove_column(index)
 
-      if ig.begin_popup_context_item('##fs-colctx-' + str(id(self)) + '-' + str(id(column))):
+      if ig.begin_popup_context_item(f'##fs-colctx-{self.id_str}-{column.id}'):
         if ig.selectable('Close')[0]:
           self._remove_column(index)
         ig.end_popup_context_item()
@@ -186,103 +247,147 @@ class FrameSheet:
     ig.columns(1)
 
 
-  def render_cell(self, frame: int, column: FrameSheetColumn) -> None:
+  def render_cell(
+    self,
+    frame: int,
+    column: FrameSheetColumn,
+    data: object,
+    context: ui.CellRenderContext,
+  ) -> None:
     cell_variable = column.variable.with_frame(frame)
 
-    data = self.pipeline.read(cell_variable)
-    formatter = EmptyFormatter() if data is None else self.formatters[cell_variable]
+    formatter = EmptyFormatter() if data is None else column.formatter
 
     changed_data, clear_edit, selected, pressed = ui.render_variable_cell(
-      f'cell-{frame}-{hash(column)}',
+      f'cell-{frame}-{column.id}',
       data,
       formatter,
       (column.width, self.row_height),
       frame == self.sequence.selected_frame,
       frame,
       self.drag_handler.highlight_range(cell_variable),
+      context,
     )
+    # Only re-read the cell if it was modified since it was rendered
+    data_changed = False
     if changed_data is not None:
       self.model.set(cell_variable, changed_data.value)
+      data_changed = True
     if clear_edit:
       self.pipeline.reset(cell_variable)
+      data_changed = True
     if selected:
       self.sequence.set_selected_frame(frame)
     if pressed:
-      self.drag_handler.begin_drag(cell_variable, self.pipeline.read(cell_variable))
+      if data_changed:
+        data = self.pipeline.read(cell_variable)
+      self.drag_handler.begin_drag(cell_variable, data)
       self.dragging = True
       self.time_started_dragging = time.time()
 
     return None
 
 
-  def render_rows(self) -> None:
+  def render_rows(self, scroll_y: float, window_height: float) -> None:
     ig.columns(len(self.columns) + 1)
-
-    min_row = int(ig.get_scroll_y() + self.scroll_delta) // self.row_height - 1
-    min_row = max(min_row, 0)
-    max_row = int(ig.get_scroll_y() + self.scroll_delta + ig.get_window_height()) // self.row_height
+    # Column widths are the same for every row, so only set them once
+    if len(self.columns) > 0:
+      ig.set_column_width(0, self.frame_column_width)
+      for index, column in enumerate(self.columns):
+        ig.set_column_width(index + 1, column.width)
+
+    row_height = self.row_height
+    mouse_pos = ig.get_mouse_pos()
+    window_pos = ig.get_window_position()
+    scroll_delta = self.scroll_delta
+    scroll_top = scroll_y + scroll_delta
+
+    # The row above the viewport is only used for drag updates and isn't rendered
+    first_visible_row = int(scroll_top) // row_height
+    min_row = max(first_visible_row - 1, 0)
+    max_row = int(scroll_top + window_height) // row_height
     # max_row = min(max_row, self.get_row_count() - 1)
 
-    self.sequence.extend_to_frame(max_row + 100)
+    # Extend in chunks so that the sequence is only touched once every few dozen rows of scrolling
+    if max_row + 50 > self.extended_to_frame:
+      self.extended_to_frame = max_row + 100
+      self.sequence.extend_to_frame(self.extended_to_frame)
 
-    timeline_operations: List[Callable[[], None]] = []
+    timeline_operations: List[Tuple[str, int]] = []
 
-    mouse_pos = (
-      ig.get_mouse_pos().x - ig.get_window_position().x,
-      ig.get_mouse_pos().y - ig.get_window_position().y + ig.get_scroll_y() + self.scroll_delta,
-    )
+    # Filled in on the first rendered row. Columns that are scrolled out of view horizontally are
+    # skipped for every row
+    column_visible = [False] * len(self.columns)
+    column_values: List[List[object]] = [[]] * len(self.columns)
+
+    mouse_y = mouse_pos.y - window_pos.y + scroll_top
+
+    item_spacing = ig.get_style().item_spacing
+    cell_context = ui.CellRenderContext(window_pos, scroll_y, item_spacing)
 
     for row in range(min_row, max_row + 1):
-      row_pos = (0.0, row * self.row_height - self.scroll_delta)
-      ig.set_cursor_pos(row_pos)
+      row_pos = (0.0, row * row_height - scroll_delta)
 
-      mouse_in_row = mouse_pos[1] > row_pos[1] and mouse_pos[1] <= row_pos[1] + self.row_height
+      mouse_in_row = mouse_y > row_pos[1] and mouse_y <= row_pos[1] + row_height
       if mouse_in_row and self.dragging and time.time() - self.time_started_dragging > 0.1:
         self.drag_handler.update_drag(row)
+      if row < first_visible_row:
+        continue
+
+      ig.set_cursor_pos(row_pos)
 
-      if len(self.columns) > 0:
-        ig.set_column_width(-1, self.frame_column_width)
       clicked, _ = ig.selectable(
-        str(row) + '##fs-framenum-' + str(id(self)) + '-' + str(row),
+        f'{row}##fs-framenum-{self.id_str}-{row}',
         row == self.sequence.selected_frame,
-        height=self.row_height - 8, # TODO: Compute padding
+        height=row_height - 8, # TODO: Compute padding
       )
       if clicked:
         self.sequence.set_selected_frame(row)
 
-      if ig.begin_popup_context_item('##fs-framenumctx-' + str(id(self)) + '-' + str(row)):
+      if ig.begin_popup_context_item(f'##fs-framenumctx-{self.id_str}-{row}'):
         if ig.selectable('Insert above')[0]:
-          def op(row):
-            return lambda: self.sequence.insert_frame(row)
-          timeline_operations.append(op(row))
+          timeline_operations.append(('insert', row))
         if ig.selectable('Insert below')[0]:
-          def op(row):
-            return lambda: self.sequence.insert_frame(row + 1)
-          timeline_operations.append(op(row))
+          timeline_operations.append(('insert', row + 1))
         if ig.selectable('Delete')[0]:
-          def op(row):
-            return lambda: self.sequence.delete_frame(row)
-          timeline_operations.append(op(row))
+          timeline_operations.append(('delete', row))
         ig.end_popup_context_item()
 
       ig.next_column()
 
-      for column in self.columns:
-        self.render_cell(row, column)
-
-        ig.set_column_width(-1, column.width)
+      for index, column in enumerate(self.columns):
+        if row == first_visible_row and ig.is_rect_visible(column.width, row_height):
+          column_visible[index] = True
+          # Read the column's visible values in one batch instead of once per cell
+          column_values[index] = \
+            self.pipeline.read_range(column.variable, first_visible_row, max_row + 1)
+        if column_visible[index]:
+          self.render_cell(row, column, column_values[index][row - first_visible_row], cell_context)
         ig.next_column()
-      ig.separator()
 
-    ig.set_cursor_pos((0, (self.sequence.max_frame + 1) * self.row_height))
+    ig.set_cursor_pos((0, (self.sequence.max_frame + 1) * row_height))
 
     ig.columns(1)
 
-    for operation in timeline_operations:
-      operation()
-
-
-  def update_scolling(self) -> None:
+    # Draw row separators directly rather than calling ig.separator for each row. This is done
+    # after ending the columns so that the lines aren't clipped to a single column
+    dl = ig.get_window_draw_list()
+    separator_color = ig.get_color_u32_idx(ig.COLOR_SEPARATOR)
+    line_x0 = window_pos.x
+    line_x1 = window_pos.x + ig.get_window_width()
+    line_y = window_pos.y - scroll_top + row_height - item_spacing.y
+    for row in range(first_visible_row, max_row + 1):
+      y = line_y + row * row_height
+      dl.add_line(line_x0, y, line_x1, y, separator_color)
+
+    for operation, frame in timeline_operations:
+      if operation == 'insert':
+        self.sequence.insert_frame(frame)
+      elif operation == 'delete':
+        self.sequence.delete_frame(frame)
+
+
+  def update_scolling(self, scroll_y: float, window_height: float) -> None:
     self.scroll_delta = 0.0
 
     if self.sequence.selected_frame == self.prev_selected_frame:
@@ -290,12 +395,12 @@ class FrameSheet:
     self.prev_selected_frame = self.sequence.selected_frame
 
     target_y = self.sequence.selected_frame * self.row_height
-    curr_scroll_y = ig.get_scroll_y()
+    curr_scroll_y = scroll_y
     current_min_y = curr_scroll_y
-    current_max_y = curr_scroll_y + ig.get_window_height() - self.row_height
+    current_max_y = curr_scroll_y + window_height - self.row_height
 
     if target_y > current_max_y:
-      new_scroll_y = target_y - ig.get_window_height() + self.row_height
+      new_scroll_y = target_y - window_height + self.row_height
     elif target_y < current_min_y:
       new_scroll_y = target_y
     else:
@@ -312,15 +417,19 @@ class FrameSheet:
     # TODO: Make the vertical scrollbar always visible?
 
     ig.begin_child('Frame Sheet Rows', flags=ig.WINDOW_ALWAYS_VERTICAL_SCROLLBAR)
-    self.update_scolling()
-    min_frame = int(ig.get_scroll_y()) // self.row_height - 1
+    # set_scroll_y only takes effect on the next frame, so these stay valid for the whole frame
+    scroll_y = ig.get_scroll_y()
+    window_height = ig.get_window_height()
+
+    self.update_scolling(scroll_y, window_height)
+    min_frame = int(scroll_y) // self.row_height - 1
     self.sequence.set_hotspot('frame-sheet-min', max(min_frame, 0))
 
     if self.dragging and not ig.is_mouse_down():
       self.drag_handler.release_drag()
       self.dragging = False
-    self.render_rows()
+    self.render_rows(scroll_y, window_height)
 
     ig.end_child()
 
-    self.columns = list(self.next_columns)
+    self._commit_columns()
@@ -2,6 +2,7 @@ from typing import *
 from glob import glob
 import os
 import re
+import time
 import traceback
 
 import wafel_core
@@ -20,6 +21,7 @@ def unlock_game_version(
   unlocked_filename: str,
 ) -> None:
   log.info(f'Unlocking game version {version}')
+  invalidate_dll_cache()
   wafel_core.unlock_libsm64(locked_filename, unlocked_filename, rom_filename)
 
 
@@ -30,12 +32,15 @@ def lock_game_version(
   locked_filename: str,
 ) -> None:
   log.info(f'Locking game version {version}')
+  invalidate_dll_cache()
   wafel_core.lock_libsm64(unlocked_filename, locked_filename, rom_filename)
 
 
+GAME_VERSION_PATTERN = re.compile(r'^sm64_([^.]+)')
+
 def get_game_version(filename: str) -> str:
   _, base = os.path.split(filename)
-  match = assert_not_none(re.match(r'^sm64_([^.]+)', base))
+  match = assert_not_none(GAME_VERSION_PATTERN.match(base))
   return match.group(1).upper()
 
 def find_locked_dlls() -> Dict[str, str]:
@@ -50,6 +55,22 @@ def find_unlocked_dlls() -> Dict[str, str]:
       for filename in glob(os.path.join(config.lib_directory, 'libsm64', 'sm64_*.dll'))
   }
 
+# The version menu is rendered every frame, so avoid listing the directory each time
+DLL_CACHE_TIMEOUT = 1.0
+dll_cache: Optional[Tuple[float, Dict[str, str], Dict[str, str]]] = None
+
+def find_dlls_cached() -> Tuple[Dict[str, str], Dict[str, str]]:
+  global dll_cache
+  now = time.monotonic()
+  if dll_cache is None or now - dll_cache[0] > DLL_CACHE_TIMEOUT:
+    dll_cache = (now, find_locked_dlls(), find_unlocked_dlls())
+  _, locked_dlls, unlocked_dlls = dll_cache
+  return locked_dlls, unlocked_dlls
+
+def invalidate_dll_cache() -> None:
+  global dll_cache
+  dll_cache = None
+
 def unlocked_game_versions() -> List[str]:
   return sorted(find_unlocked_dlls())
 
@@ -65,16 +86,19 @@ def render_game_version_menu(
 
   ig.text('Wafel requires a vanilla SM64 ROM to run')
 
-  locked_dlls = find_locked_dlls()
-  unlocked_dlls = find_unlocked_dlls()
+  locked_dlls, unlocked_dlls = find_dlls_cached()
   versions = sorted(set(locked_dlls.keys()).union(unlocked_dlls.keys()))
 
   ig.dummy(1, 5)
 
   error_msgs: Dict[str, str] = use_state('error-msgs', cast(Dict[str, str], dict())).value
-  for version in unlocked_dlls:
-    if version in error_msgs:
-      del error_msgs[version]
+  # The cached listing is only replaced when the directory is re-read, so this only runs when
+  # the unlocked versions may have changed
+  prev_unlocked_dlls: Ref[Optional[Dict[str, str]]] = use_state('prev-unlocked-dlls', None)
+  if unlocked_dlls is not prev_unlocked_dlls.value:
+    prev_unlocked_dlls.value = unlocked_dlls
+    for version in unlocked_dlls:
+      error_msgs.pop(version, None)
 
   for version in versions:
     ig.push_id('version-' + version)
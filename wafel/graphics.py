@@ -30,33 +30,38 @@ def render_game(
   scene.camera = camera
   scene.show_camera_target = show_camera_target
 
-  model.pipeline.read_surfaces_to_scene(scene, model.selected_frame)
   scene.wall_hitbox_radius = wall_hitbox_radius
   scene.hovered_surface = hovered_surface
   scene.hidden_surfaces = hidden_surfaces
 
-  model.pipeline.read_objects_to_scene(scene, model.selected_frame)
+  model.pipeline.read_scene(scene, model.selected_frame)
 
   if model.play_speed <= 0 or not model.playback_mode:
     path_frames = range(max(model.selected_frame - 5, 0), model.selected_frame + 61)
   else:
     path_frames = range(max(model.selected_frame - 60, 0), model.selected_frame + 6)
   mario_path = model.pipeline.read_mario_path(path_frames.start, path_frames.stop)
-  mario_path.root_index = path_frames.index(model.selected_frame)
+  root_index = model.selected_frame - path_frames.start
+  mario_path.root_index = root_index
 
   log.timer.begin('qsteps')
   qstep_frame = model.selected_frame + 1
   num_steps = dcast(int, model.get(qstep_frame, 'gQStepsInfo.numSteps'))
 
-  quarter_steps = []
-  for i in range(num_steps):
-    quarter_step_value = dcast(dict, model.get(qstep_frame, f'gQStepsInfo.steps[{i}]'))
-    quarter_step = QuarterStep()
-    quarter_step.intended_pos = quarter_step_value['intendedPos']
-    quarter_step.result_pos = quarter_step_value['resultPos']
-    quarter_steps.append(quarter_step)
+  # Path nodes start with no quarter steps, so there's nothing to read or set if there are none
+  if num_steps > 0:
+    # Read the whole array at once rather than one path read per step
+    quarter_step_values = dcast(list, model.get(qstep_frame, 'gQStepsInfo.steps'))
 
-  mario_path.set_quarter_steps(path_frames.index(qstep_frame) - 1, quarter_steps)
+    quarter_steps = []
+    for quarter_step_value in quarter_step_values[:num_steps]:
+      quarter_step = QuarterStep()
+      quarter_step.intended_pos = quarter_step_value['intendedPos']
+      quarter_step.result_pos = quarter_step_value['resultPos']
+      quarter_steps.append(quarter_step)
+
+    # The quarter steps for qstep_frame lead out of the selected frame's node
+    mario_path.set_quarter_steps(root_index, quarter_steps)
   log.timer.end()
 
   scene.object_paths = [mario_path]
@@ -65,6 +70,6 @@ def render_game(
 
 
 __all__ = [
-  'get_scenes',
+  'take_scenes',
   'render_game',
 ]
@@ -27,11 +27,15 @@ def _push_logical_id(args: Tuple[object, ...]) -> None:
 def _should_push_id(name: str) -> bool:
   return name.startswith('begin') or name == 'push_id'
 
+# The wrappers below bind the stack methods as closure variables since they run for every begin/end
+# call
+
 def _unconditional_begin_call(name: str) -> Any:
   push_id = _should_push_id(name)
   ig_func = getattr(ig, name)
+  stack_append = _stack.append
   def func(*args, **kwargs):
-    _stack.append((name, (args, kwargs)))
+    stack_append((name, (args, kwargs)))
     if push_id:
       _push_logical_id(args)
     return ig_func(*args, **kwargs)
@@ -47,10 +51,11 @@ def _begin_child(*args, **kwargs):
 def _conditional_begin_call(name: str) -> Any:
   push_id = _should_push_id(name)
   ig_func = getattr(ig, name)
+  stack_append = _stack.append
   def func(*args, **kwargs):
     result = ig_func(*args, **kwargs)
     if result:
-      _stack.append((name, (args, kwargs)))
+      stack_append((name, (args, kwargs)))
       if push_id:
         _push_logical_id(args)
     return result
@@ -83,15 +88,17 @@ def _end_call(name: str) -> Any:
   ig_func = getattr(ig, name)
 
   pop_id = _should_pop_id(name)
+  stack = _stack
+  id_stack_pop = _id_stack.pop
 
   def func():
-    if len(_stack) == 0 or _stack[-1][0] != matching:
-      for item in _stack:
+    if len(stack) == 0 or stack[-1][0] != matching:
+      for item in stack:
         log.error(' ', item[0], *item[1])
       assert False, 'Expected ' + matching
-    _stack.pop()
+    stack.pop()
     if pop_id:
-      _id_stack.pop()
+      id_stack_pop()
     ig_func()
 
   return func
@@ -177,3 +184,14 @@ def disableable_button(*args, **kwargs):
     ig.pop_style_color()
     ig.pop_style_var()
   return result
+
+
+# Bind the wrapped imgui functions as module globals so that attribute lookups don't need to go
+# through __getattr__. Names defined above take precedence
+def _bind_funcs() -> None:
+  module_globals = globals()
+  for name in dir(ig):
+    if not name.startswith('_') and name not in module_globals:
+      module_globals[name] = get_func(name)
+
+_bind_funcs()
@@ -1,10 +1,13 @@
 from typing import *
+import functools
 
 from wafel_core import IntendedStick, stick_intended_to_raw_heuristic
 
 from wafel.util import *
 
 
+# Edits to the same frame tend to repeat the same inputs, so cache the search results
+@functools.lru_cache(maxsize=4096)
 def intended_to_raw(
   face_yaw: int,
   camera_yaw: int,
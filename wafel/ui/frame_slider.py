@@ -28,14 +28,22 @@ def render_frame_slider(
   )
   ig.pop_item_width()
 
+  # Merge markers that touch or overlap into a single rect to reduce the number of draw commands
   dl = ig.get_window_draw_list()
-  for frame in loaded_frames:
-    line_pos = pos[0] + frame / num_frames * width
-    dl.add_line(
-      line_pos, pos[1] + 13,
-      line_pos, pos[1] + 18,
-      ig.get_color_u32_rgba(1, 0, 0, 1),
-    )
+  color = ig.get_color_u32_rgba(1, 0, 0, 1)
+  scale = width / num_frames
+  run_start: Optional[float] = None
+  run_end = 0.0
+  for frame in sorted(loaded_frames):
+    line_pos = pos[0] + frame * scale
+    if run_start is not None and line_pos <= run_end + 1:
+      run_end = line_pos
+      continue
+    if run_start is not None:
+      dl.add_rect_filled(run_start, pos[1] + 13, run_end + 1, pos[1] + 18, color)
+    run_start = run_end = line_pos
+  if run_start is not None:
+    dl.add_rect_filled(run_start, pos[1] + 13, run_end + 1, pos[1] + 18, color)
 
   ig.pop_id()
 
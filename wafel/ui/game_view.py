@@ -19,6 +19,13 @@ from wafel.bindings import input_float
 # TODO: Rename to game_view_overlay. Reduce parameters to minimum (don't require full Model)
 
 
+def point_in_window(point: Tuple[float, float]) -> bool:
+  window_x, window_y = ig.get_window_position()
+  window_w, window_h = ig.get_window_size()
+  return window_x <= point[0] < window_x + window_w and \
+    window_y <= point[1] < window_y + window_h
+
+
 class MouseTracker:
   def __init__(self) -> None:
     self.dragging = False
@@ -28,10 +35,7 @@ class MouseTracker:
   def is_mouse_in_window(self) -> bool:
     if not ig.global_mouse_capture():
       return False
-    window_x, window_y = cast(Iterable[float], ig.get_window_position())
-    window_w, window_h = cast(Iterable[float], ig.get_window_size())
-    return self.mouse_pos[0] >= window_x and self.mouse_pos[0] < window_x + window_w and \
-      self.mouse_pos[1] >= window_y and self.mouse_pos[1] < window_y + window_h
+    return point_in_window(self.mouse_pos)
 
   def get_drag_amount(self) -> Tuple[float, float]:
     mouse_was_down = self.mouse_down
@@ -48,10 +52,7 @@ class MouseTracker:
       )
 
     elif not mouse_was_down and self.mouse_down and not ig.is_any_item_hovered():
-      window_x, window_y = ig.get_window_position()
-      window_w, window_h = ig.get_window_size()
-      if self.mouse_pos[0] >= window_x and self.mouse_pos[0] < window_x + window_w and \
-          self.mouse_pos[1] >= window_y and self.mouse_pos[1] < window_y + window_h:
+      if point_in_window(self.mouse_pos):
         self.dragging = True
 
     return (0, 0)
@@ -67,10 +68,11 @@ Vec3f = Tuple[float, float, float]
 
 
 def angle_to_direction(pitch: float, yaw: float) -> Vec3f:
+  cos_pitch = math.cos(pitch)
   return (
-    math.cos(pitch) * math.sin(yaw),
+    cos_pitch * math.sin(yaw),
     math.sin(pitch),
-    math.cos(pitch) * math.cos(yaw),
+    cos_pitch * math.cos(yaw),
   )
 
 
@@ -82,23 +84,32 @@ def direction_to_angle(dir: Vec3f) -> Tuple[float, float]:
 
 
 def get_viewport(framebuffer_size: Tuple[int, int]) -> core.Viewport:
-  window_pos = tuple(map(int, ig.get_window_position()))
-  window_size = tuple(map(int, ig.get_window_size()))
+  window_x, window_y = ig.get_window_position()
+  window_w, window_h = ig.get_window_size()
 
   viewport = core.Viewport()
-  viewport.x = window_pos[0]
-  viewport.y = window_pos[1]
-  viewport.width = window_size[0]
-  viewport.height = window_size[1]
+  viewport.x = int(window_x)
+  viewport.y = int(window_y)
+  viewport.width = int(window_w)
+  viewport.height = int(window_h)
 
   return viewport
 
 
+MARIO_POS_VARIABLES = (
+  Variable('mario-pos-x'),
+  Variable('mario-pos-y'),
+  Variable('mario-pos-z'),
+)
+
+
 def get_mario_pos(model: Model) -> Vec3f:
+  frame = model.selected_frame
+  x, y, z = MARIO_POS_VARIABLES
   return (
-    dcast(float, model.get(Variable('mario-pos-x').with_frame(model.selected_frame))),
-    dcast(float, model.get(Variable('mario-pos-y').with_frame(model.selected_frame))),
-    dcast(float, model.get(Variable('mario-pos-z').with_frame(model.selected_frame))),
+    dcast(float, model.get(x.with_frame(frame))),
+    dcast(float, model.get(y.with_frame(frame))),
+    dcast(float, model.get(z.with_frame(frame))),
   )
 
 
@@ -117,16 +128,12 @@ def move_toward(x: Vec3f, target: Vec3f, delta: float) -> Vec3f:
 def get_normalized_mouse_pos() -> Optional[Tuple[float, float]]:
   if not ig.global_mouse_capture():
     return None
-  window_pos = tuple(map(int, ig.get_window_position()))
-  window_size = tuple(map(int, ig.get_window_size()))
-  mouse_pos = tuple(map(float, ig.get_mouse_pos()))
-  mouse_pos = (
-    mouse_pos[0] - window_pos[0],
-    window_size[1] - mouse_pos[1] + window_pos[1],
-  )
+  window_x, window_y = ig.get_window_position()
+  window_w, window_h = ig.get_window_size()
+  mouse_x, mouse_y = ig.get_mouse_pos()
   mouse_pos = (
-    2 * mouse_pos[0] / window_size[0] - 1,
-    2 * mouse_pos[1] / window_size[1] - 1,
+    2 * (mouse_x - int(window_x)) / int(window_w) - 1,
+    2 * (int(window_h) - mouse_y + int(window_y)) / int(window_h) - 1,
   )
   if any(c < -1 or c > 1 for c in mouse_pos):
     return None
@@ -134,7 +141,8 @@ def get_normalized_mouse_pos() -> Optional[Tuple[float, float]]:
 
 
 def get_mouse_ray(camera: core.RotateCamera) -> Optional[Tuple[Vec3f, Vec3f]]:
-  window_size = tuple(map(int, ig.get_window_size()))
+  window_w, window_h = ig.get_window_size()
+  window_size = (int(window_w), int(window_h))
   mouse_pos = get_normalized_mouse_pos()
   if mouse_pos is None:
     return None
@@ -159,7 +167,8 @@ def get_mouse_ray(camera: core.RotateCamera) -> Optional[Tuple[Vec3f, Vec3f]]:
 
 
 def get_mouse_world_pos_birds_eye(camera: core.BirdsEyeCamera) -> Optional[Tuple[float, float]]:
-  window_size = tuple(map(int, ig.get_window_size()))
+  window_w, window_h = ig.get_window_size()
+  window_size = (int(window_w), int(window_h))
   mouse_pos = get_normalized_mouse_pos()
   if mouse_pos is None:
     return None
@@ -222,7 +231,7 @@ def use_rotational_camera(
       zoom.value = math.log(offset / 1500, 0.5)
     fov_y = math.radians(cast(float, model.get(model.selected_frame, 'sFOVState.fov')))
 
-  offset = 1500 * math.pow(0.5, zoom.value)
+  offset = 1500 * 0.5 ** zoom.value
   face_direction = angle_to_direction(pitch.value, yaw.value)
 
   move = [0.0, 0.0, 0.0] # forward, up, right
@@ -400,7 +409,7 @@ def render_game_view_birds_eye(
 
   drag_amount = mouse_state.get_drag_amount()
   zoom.value += mouse_state.get_wheel_amount() / 5
-  world_span_x = 200 / math.pow(2, zoom.value)
+  world_span_x = 200 / 2 ** zoom.value
 
   viewport = get_viewport(framebuffer_size)
 
@@ -1,4 +1,5 @@
 from typing import *
+from dataclasses import dataclass
 
 import wafel.imgui as ig
 
@@ -9,6 +10,15 @@ from wafel.ui.variable_value import render_variable_value
 
 T = TypeVar('T')
 
+
+@dataclass(frozen=True)
+class CellRenderContext:
+  """Window state shared by every cell rendered in the same window on a frame."""
+  window_pos: Tuple[float, float]
+  scroll_y: float
+  item_spacing: Tuple[float, float]
+
+
 def render_variable_cell(
   id: str,
   value: T,
@@ -17,16 +27,23 @@ def render_variable_cell(
   is_selected: bool,
   frame: Optional[int] = None,
   highlight_range: Optional[Tuple[range, ig.Color4f]] = None,
+  context: Optional[CellRenderContext] = None,
 ) -> Tuple[Maybe[T], bool, bool, bool]:
   ig.push_id(id)
 
-  window_pos = ig.get_window_position()
-  item_spacing = ig.get_style().item_spacing
+  if context is None:
+    context = CellRenderContext(
+      ig.get_window_position(),
+      ig.get_scroll_y(),
+      ig.get_style().item_spacing,
+    )
+  window_pos = context.window_pos
+  item_spacing = context.item_spacing
 
   cell_cursor_pos = ig.get_cursor_pos()
   cell_cursor_pos = (
-    cell_cursor_pos.x + window_pos.x - item_spacing.x,
-    cell_cursor_pos.y + window_pos.y - ig.get_scroll_y() - item_spacing.y,
+    cell_cursor_pos.x + window_pos[0] - item_spacing[0],
+    cell_cursor_pos.y + window_pos[1] - context.scroll_y - item_spacing[1],
   )
 
   if highlight_range is not None:
@@ -49,8 +66,8 @@ def render_variable_cell(
     value,
     formatter,
     (
-      cell_size[0] - 2 * item_spacing.x,
-      cell_size[1] - 2 * item_spacing.y,
+      cell_size[0] - 2 * item_spacing[0],
+      cell_size[1] - 2 * item_spacing[1],
     ),
     highlight = is_selected,
   )
@@ -61,4 +78,4 @@ def render_variable_cell(
   return changed_data, clear_edit, selected, pressed
 
 
-__all__ = ['render_variable_cell']
+__all__ = ['CellRenderContext', 'render_variable_cell']
@@ -26,6 +26,9 @@ class VariablePipeline(Protocol):
   @abstractmethod
   def read(self, variable: Variable) -> object: ...
 
+  @abstractmethod
+  def read_range(self, variable: Variable, frame_start: int, frame_end: int) -> List[object]: ...
+
   @abstractmethod
   def write(self, variable: Variable, value: object) -> None: ...
 
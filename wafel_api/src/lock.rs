@@ -25,7 +25,7 @@ pub fn try_lock_libsm64(
     rom_filename: &str,
 ) -> Result<(), Error> {
     let input = read_file(input_filename)?;
-    let rom = rom_to_z64(&read_file(rom_filename)?)?;
+    let rom = rom_to_z64(read_file(rom_filename)?)?;
 
     let pwbox = Sodium::build_box(&mut rand::thread_rng())
         .seal(&rom, &input)
@@ -64,7 +64,7 @@ pub fn try_unlock_libsm64(
     rom_filename: &str,
 ) -> Result<(), Error> {
     let input = read_file(input_filename)?;
-    let rom = rom_to_z64(&read_file(rom_filename)?)?;
+    let rom = rom_to_z64(read_file(rom_filename)?)?;
 
     let erased_pwbox: ErasedPwBox =
         serde_json::from_slice(&input).map_err(|_| Error::Libsm64DecryptionError)?;
@@ -104,33 +104,29 @@ fn write_file(filename: &str, bytes: &[u8]) -> Result<(), Error> {
     })
 }
 
-fn rom_to_z64(bytes: &[u8]) -> Result<Vec<u8>, Error> {
+fn rom_to_z64(mut bytes: Vec<u8>) -> Result<Vec<u8>, Error> {
     if bytes.len() < 4 || bytes.len() % 4 != 0 {
         return Err(Error::InvalidRom);
     }
-    let bom = &bytes[0..4];
-    match bom {
-        b"\x80\x37\x12\x40" => Ok(bytes.to_vec()),
-        b"\x37\x80\x40\x12" => Ok(swap_bytes_16(bytes)),
-        b"\x40\x12\x37\x80" => Ok(swap_bytes_32(bytes)),
-        _ => Err(Error::InvalidRom),
+    match &bytes[0..4] {
+        b"\x80\x37\x12\x40" => {}
+        b"\x37\x80\x40\x12" => swap_bytes_16(&mut bytes),
+        b"\x40\x12\x37\x80" => swap_bytes_32(&mut bytes),
+        _ => return Err(Error::InvalidRom),
     }
+    Ok(bytes)
 }
 
-fn swap_bytes_16(bytes: &[u8]) -> Vec<u8> {
+fn swap_bytes_16(bytes: &mut [u8]) {
     assert_eq!(bytes.len() % 2, 0);
-    let mut output = Vec::with_capacity(bytes.len());
-    for chunk in bytes.chunks_exact(2) {
-        output.extend([chunk[1], chunk[0]]);
+    for chunk in bytes.chunks_exact_mut(2) {
+        chunk.swap(0, 1);
     }
-    output
 }
 
-fn swap_bytes_32(bytes: &[u8]) -> Vec<u8> {
+fn swap_bytes_32(bytes: &mut [u8]) {
     assert_eq!(bytes.len() % 4, 0);
-    let mut output = Vec::with_capacity(bytes.len());
-    for chunk in bytes.chunks_exact(4) {
-        output.extend([chunk[3], chunk[2], chunk[1], chunk[0]]);
+    for chunk in bytes.chunks_exact_mut(4) {
+        chunk.reverse();
     }
-    output
 }
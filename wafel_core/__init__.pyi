@@ -17,6 +17,7 @@ class Pipeline:
   def load_reusing_edits(dll_path: str, prev_pipeline: Pipeline) -> Pipeline: ...
 
   def read(self, variable: Variable) -> object: ...
+  def read_range(self, variable: Variable, frame_start: int, frame_end: int) -> List[object]: ...
   def write(self, variable: Variable, value: object) -> None: ...
   def reset(self, variable: Variable) -> None: ...
 
@@ -57,6 +58,7 @@ class Pipeline:
   ) -> Optional[int]: ...
   def read_surfaces_to_scene(self, scene: Scene, frame: int) -> None: ...
   def read_objects_to_scene(self, scene: Scene, frame: int) -> None: ...
+  def read_scene(self, scene: Scene, frame: int) -> None: ...
   def read_mario_path(self, frame_start: int, frame_end: int) -> ObjectPath: ...
 
 
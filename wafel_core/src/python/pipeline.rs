@@ -123,6 +123,26 @@ impl PyPipeline {
         Ok(py_object)
     }
 
+    /// Read a variable on each frame in `frame_start..frame_end`.
+    ///
+    /// This is equivalent to calling `read` with the variable on each frame, but avoids
+    /// crossing into Rust once per frame.
+    pub fn read_range(
+        &self,
+        py: Python<'_>,
+        variable: &PyVariable,
+        frame_start: u32,
+        frame_end: u32,
+    ) -> PyResult<Vec<PyObject>> {
+        let pipeline = &self.get().pipeline;
+        (frame_start..frame_end)
+            .map(|frame| {
+                let value = pipeline.read(&variable.variable.with_frame(frame))?;
+                value_to_py_object(py, &value)
+            })
+            .collect()
+    }
+
     /// Write a variable.
     ///
     /// If the variable is a data variable, the value will be truncated and written
@@ -407,11 +427,21 @@ impl PyPipeline {
         Ok(())
     }
 
+    /// Load the SM64 surfaces and objects from the game state and add them to the scene.
+    ///
+    /// This is equivalent to calling `read_surfaces_to_scene` and `read_objects_to_scene`.
+    pub fn read_scene(&self, scene: &mut Scene, frame: u32) -> PyResult<()> {
+        let timeline = self.get().pipeline.timeline();
+        read_surfaces_to_scene(scene, timeline, frame)?;
+        read_objects_to_scene(scene, timeline, frame)?;
+        Ok(())
+    }
+
     /// Add an object path for mario to the scene, using the given frame range.
     pub fn read_mario_path(&self, frame_start: u32, frame_end: u32) -> PyResult<scene::ObjectPath> {
         let timeline = self.get().pipeline.timeline();
 
-        let mut nodes = Vec::new();
+        let mut nodes = Vec::with_capacity(frame_end.saturating_sub(frame_start) as usize);
         for frame in frame_start..frame_end {
             let pos_coords = timeline
                 .try_read(frame, "gMarioState->pos")